@@ -6,7 +6,7 @@ from typing import Optional, List, Tuple
 
 from fractal_blockchain.blockchain.block import FractalBlock, FractalBlockHeader, PlaceholderTransaction
 from fractal_blockchain.core.geometry_validator import is_valid_addressed_coordinate
-from fractal_blockchain.structures.merkle import build_merkle_tree_from_hashes, hash_data
+from fractal_blockchain.structures.merkle import build_merkle_root, hash_data
 import json # For serializing transactions for Merkle root calculation
 
 
@@ -137,8 +137,7 @@ class BlockValidator:
         if not tx_ids: # Should not happen if transactions list is not empty
             return None
 
-        merkle_root_node = build_merkle_tree_from_hashes(tx_ids)
-        return merkle_root_node.value if merkle_root_node else None
+        return build_merkle_root(tx_ids) # Only the root is needed, so no tree nodes are built
 
 
     def validate_block_in_chain_context(self, block: FractalBlock, parent_block: FractalBlock) -> BlockValidationResult:
@@ -201,7 +200,7 @@ if __name__ == '__main__':
     # Create a valid child block
     tx1 = PlaceholderTransaction(id="tx_val_1", data={"val": 10})
     tx_hashes_val = [hash_data(json.dumps(tx1.to_json_serializable(), sort_keys=True))]
-    m_root_val = build_merkle_tree_from_hashes(tx_hashes_val).value
+    m_root_val = build_merkle_root(tx_hashes_val)
 
     valid_child_coord = AddressedFractalCoordinate(1, (0,)) # Child of Genesis at (0,())
     valid_child_header = FractalBlockHeader(
@@ -1,5 +1,6 @@
 # Fractal Coordinate Addressing System
 
+import functools
 from typing import Tuple, Optional, Union
 from fractal_blockchain.core.mathematics.fractal_math import FractalCoordinate
 
@@ -34,16 +35,35 @@ class AddressedFractalCoordinate(FractalCoordinate):
         # self = super().__new__(cls, depth, path)
         # For NamedTuple, it's better to just let it be created if structure is same
         instance = super(AddressedFractalCoordinate, cls).__new__(cls, depth, path)
+        # Coordinates are immutable, so the void check is done once here rather than per call.
+        instance._is_void = 3 in path
         return instance
 
+    @classmethod
+    def get(cls, depth: int, path: Tuple[int, ...]) -> "AddressedFractalCoordinate":
+        """
+        Returns a shared (interned) instance for (depth, path), validating it only on first use.
+        Raises ValueError like the constructor for invalid coordinates.
+        """
+        return _interned_coordinate(cls, depth, tuple(path))
+
     def is_void_path(self) -> bool:
         """Checks if any part of the path goes through a void (digit 3)."""
-        return 3 in self.path
+        try:
+            return self._is_void
+        except AttributeError: # Built by _make/_replace, which bypass __new__
+            self._is_void = 3 in self.path
+            return self._is_void
 
     def is_solid_path(self) -> bool:
         """Checks if the path refers to a solid triangle (only digits 0, 1, 2)."""
         return not self.is_void_path()
 
+# Tuple subclasses cannot be weakly referenced, so interned coordinates are held in a bounded LRU cache.
+@functools.lru_cache(maxsize=8192)
+def _interned_coordinate(cls, depth: int, path: Tuple[int, ...]) -> AddressedFractalCoordinate:
+    return cls(depth, path)
+
 # --- Address Encoding/Decoding ---
 
 def coord_to_string(coord: Union[FractalCoordinate, AddressedFractalCoordinate]) -> str:
@@ -1,5 +1,6 @@
 # Fractal Geometry Validator
 
+import functools
 from typing import List, Optional, Tuple
 
 from fractal_blockchain.core.mathematics.fractal_math import (
@@ -137,7 +138,7 @@ def get_neighbors(coord: AddressedFractalCoordinate) -> List[AddressedFractalCoo
         if i == current_child_idx:
             continue
         try:
-            sibling_coord = AddressedFractalCoordinate(depth=coord.depth, path=parent_path + (i,))
+            sibling_coord = AddressedFractalCoordinate.get(coord.depth, parent_path + (i,))
             neighbors.add(sibling_coord)
         except ValueError:
             pass # Invalid path
@@ -179,6 +180,16 @@ def get_neighbors(coord: AddressedFractalCoordinate) -> List[AddressedFractalCoo
     return list(neighbors)
 
 
+@functools.lru_cache(maxsize=8192)
+def get_neighbors_cached(coord: AddressedFractalCoordinate) -> Tuple[AddressedFractalCoordinate, ...]:
+    """
+    Memoized get_neighbors for hot paths (path validation, peer discovery, routing).
+    get_neighbors depends only on (depth, path), so results are cached per coordinate and
+    returned as an immutable tuple so callers cannot corrupt the shared cached value.
+    """
+    return tuple(get_neighbors(coord))
+
+
 # --- Orphaned/Invalid Positions ---
 def is_orphaned(coord: AddressedFractalCoordinate) -> bool:
     """
@@ -2,9 +2,10 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Any, Optional
 import time
 import hashlib
+import threading
 
-from fractal_blockchain.core.addressing import AddressedFractalCoordinate, coord_to_string
-from fractal_blockchain.mining.reward_system import FractalRewardSystem # For block rewards
+from fractal_blockchain.core.addressing import AddressedFractalCoordinate
+from fractal_blockchain.mining.reward_system import FractalRewardSystem, MAX_REWARD_CALCULATION_DEPTH # For block rewards
 from fractal_blockchain.mining.difficulty_adjuster import DifficultyAdjuster # For understanding network difficulty
 
 
@@ -15,6 +16,13 @@ from fractal_blockchain.mining.difficulty_adjuster import DifficultyAdjuster # F
 # This can be varied per fractal depth by the pool.
 DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX = "0" # Very easy for shares, e.g., hash must start with "0"
 
+# Share weight is a pure function of depth, so the common depths are precomputed once.
+# Weight = 1.0 for depth 0, +0.5 for each depth level (never below 0.1).
+def _share_weight_for_depth(depth: int) -> float:
+    return max(0.1, 1.0 + depth * 0.5)
+
+_SHARE_WEIGHT_TABLE: Tuple[float, ...] = tuple(_share_weight_for_depth(d) for d in range(MAX_REWARD_CALCULATION_DEPTH + 1))
+
 @dataclass(frozen=True)
 class PoolShare:
     """Represents a share submitted by a miner to the pool."""
@@ -53,6 +61,9 @@ class FractalMiningPool:
         # A round ends when the pool finds a block.
         self.current_round_shares: List[PoolShare] = []
         self.total_weighted_shares_this_round: float = 0.0
+        # Guards the round accounting above and miner registration; share validation, weighting and
+        # payouts run outside it so concurrent submitters contend for a few in-memory updates only.
+        self._round_lock = threading.Lock()
 
         # Pool's target difficulty for shares (can be dynamic per fractal coordinate)
         # For simplicity, a function that returns a prefix string like "0", "00"
@@ -62,8 +73,11 @@ class FractalMiningPool:
         self.payouts: Dict[str, float] = {} # miner_id -> total_paid_out
 
     def register_miner(self, miner_id: str):
-        if miner_id not in self.miners:
-            self.miners[miner_id] = MinerContribution(miner_id=miner_id)
+        with self._round_lock: # The round snapshot iterates self.miners
+            registered = miner_id not in self.miners
+            if registered:
+                self.miners[miner_id] = MinerContribution(miner_id=miner_id)
+        if registered:
             print(f"[Pool-{self.pool_id}] Miner {miner_id} registered.")
         else:
             print(f"[Pool-{self.pool_id}] Miner {miner_id} already registered.")
@@ -88,23 +102,17 @@ class FractalMiningPool:
         Shares from deeper/harder coordinates should contribute more.
         This could be proportional to the network difficulty of the share's coordinate.
         """
-        # Using difficulty_adjuster to get an idea of the network difficulty for this coordinate's depth
-        # This is a proxy for the "value" of work done at this coordinate.
-        # A share's weight could be proportional to the network difficulty of its coordinate.
-        # network_diff_at_coord = self.difficulty_adjuster.get_current_difficulty(share_coord.depth, coord_to_string(share_coord))
-        # For simulation, let's use a simpler scheme: base weight + bonus for depth.
-        # Weight = 1.0 for depth 0, +0.1 for each depth level.
-        weight = 1.0 + (share_coord.depth * 0.5) # Example: Deeper shares are linearly more valuable to the pool
         # This should ideally be tied to the actual network difficulty target for that coordinate.
         # A share represents 1 / PoolDifficulty work. Its value in finding a block is related to NetworkDifficulty.
         # So, value ~ NetworkDifficulty / PoolDifficulty.
-        # If PoolDifficulty is uniform (e.g. "0" prefix for all shares), then value ~ NetworkDifficulty.
-        # The network_diff_at_coord from difficulty_adjuster is a good proxy.
-        network_difficulty_metric = self.difficulty_adjuster.get_current_difficulty(share_coord.depth, coord_to_string(share_coord))
-        # Normalize or scale this metric. Let's assume it's > 0. A base difficulty (e.g. depth 0) might be 1.0.
-        # Weight could be network_difficulty_metric / base_pool_difficulty_reference
-        # For now, using the simpler depth-based weight:
-        return max(0.1, weight) # Ensure non-zero weight
+        # If PoolDifficulty is uniform (e.g. "0" prefix for all shares), then value ~ NetworkDifficulty, and
+        # self.difficulty_adjuster.get_current_difficulty(depth, coord_to_string(coord)) is a good proxy.
+        # For simulation, a simpler scheme is used: deeper shares are linearly more valuable to the pool
+        # (see _SHARE_WEIGHT_TABLE).
+        depth = share_coord.depth
+        if 0 <= depth < len(_SHARE_WEIGHT_TABLE):
+            return _SHARE_WEIGHT_TABLE[depth]
+        return _share_weight_for_depth(depth)
 
 
     def submit_share(self, miner_id: str, fractal_coord: AddressedFractalCoordinate, nonce: int, mined_hash: str):
@@ -125,9 +133,10 @@ class FractalMiningPool:
 
         share = PoolShare(miner_id=miner_id, fractal_coord=fractal_coord, nonce=nonce, mined_hash=mined_hash, share_weight=weight)
 
-        self.current_round_shares.append(share)
-        self.miners[miner_id].add_share_weight(weight)
-        self.total_weighted_shares_this_round += weight
+        with self._round_lock:
+            self.current_round_shares.append(share)
+            self.miners[miner_id].add_share_weight(weight)
+            self.total_weighted_shares_this_round += weight
 
         print(f"[Pool-{self.pool_id}] Valid share accepted from {miner_id} for {fractal_coord} (Hash: {mined_hash}, Weight: {weight:.2f}). Total round shares: {self.total_weighted_shares_this_round:.2f}.")
         return True
@@ -138,33 +147,42 @@ class FractalMiningPool:
         Distributes rewards for the current round and starts a new round.
         """
         actual_block_reward = self.reward_system.calculate_block_reward(block_fractal_coord.depth)
+        # Shares submitted from here on count toward the next round, so none are reset unpaid.
+        total_weighted_shares, round_weights = self._start_new_round()
         print(f"\n[Pool-{self.pool_id}] BLOCK FOUND on {block_fractal_coord}! Total network reward: {actual_block_reward:.4f}")
         print(f"  Block likely found by share from miner: {block_finder_miner_id if block_finder_miner_id else 'Pool directly (solo effort within pool)'}")
-        print(f"  Distributing reward based on {self.total_weighted_shares_this_round:.2f} total weighted shares this round.")
+        print(f"  Distributing reward based on {total_weighted_shares:.2f} total weighted shares this round.")
 
-        if self.total_weighted_shares_this_round == 0:
+        if total_weighted_shares == 0:
             print(f"[Pool-{self.pool_id}] No shares in this round. Reward not distributed (or goes to pool operator).")
-            self._start_new_round()
             return
 
         # Proportional reward distribution
-        for miner_id, contribution_data in self.miners.items():
-            if contribution_data.total_weighted_shares > 0:
-                proportion = contribution_data.total_weighted_shares / self.total_weighted_shares_this_round
-                miner_reward = actual_block_reward * proportion
+        for miner_id, weighted_shares in round_weights.items():
+            proportion = weighted_shares / total_weighted_shares
+            miner_reward = actual_block_reward * proportion
 
-                # Simulate payout (in a real system, this would go to balances/wallets)
-                self.payouts[miner_id] = self.payouts.get(miner_id, 0.0) + miner_reward
-                print(f"  - Miner {miner_id}: {contribution_data.total_weighted_shares:.2f} weighted shares ({proportion*100:.2f}%) -> Reward: {miner_reward:.4f}")
+            # Simulate payout (in a real system, this would go to balances/wallets)
+            self.payouts[miner_id] = self.payouts.get(miner_id, 0.0) + miner_reward
+            print(f"  - Miner {miner_id}: {weighted_shares:.2f} weighted shares ({proportion*100:.2f}%) -> Reward: {miner_reward:.4f}")
 
-        self._start_new_round()
-
-    def _start_new_round(self):
+    def _start_new_round(self) -> Tuple[float, Dict[str, float]]:
+        """
+        Closes the current round and starts a new one.
+        Returns the closed round's total weighted shares and the non-zero weight of each miner,
+        snapshotted under the same lock as the reset.
+        """
         print(f"[Pool-{self.pool_id}] Starting new mining round.")
-        self.current_round_shares = []
-        self.total_weighted_shares_this_round = 0.0
-        for miner_id in self.miners:
-            self.miners[miner_id].reset_for_round()
+        with self._round_lock:
+            total_weighted_shares = self.total_weighted_shares_this_round
+            round_weights = {miner_id: contribution.total_weighted_shares
+                             for miner_id, contribution in self.miners.items()
+                             if contribution.total_weighted_shares > 0}
+            self.current_round_shares = []
+            self.total_weighted_shares_this_round = 0.0
+            for contribution in self.miners.values():
+                contribution.reset_for_round()
+        return total_weighted_shares, round_weights
 
     def get_miner_payouts(self, miner_id: str) -> float:
         return self.payouts.get(miner_id, 0.0)
@@ -1,4 +1,5 @@
 import math
+from typing import Dict
 
 # --- Configuration for Reward System ---
 
@@ -39,6 +40,10 @@ class FractalRewardSystem:
         self.max_calc_depth = max_calc_depth
         self.min_reward = min_reward
 
+        # Final rewards keyed by the capped calculation depth. Depths beyond max_calc_depth share
+        # the max_calc_depth entry, so at most max_calc_depth + 1 exponentiations are ever performed.
+        self._reward_table: Dict[int, float] = {}
+
     def calculate_block_reward(self, fractal_depth: int) -> float:
         """
         Calculates the mining reward for a block found at a given fractal_depth.
@@ -61,6 +66,10 @@ class FractalRewardSystem:
 
         depth_for_calculation = min(effective_depth, self.max_calc_depth)
 
+        cached_reward = self._reward_table.get(depth_for_calculation)
+        if cached_reward is not None:
+            return cached_reward
+
         current_reward = self.base_reward * (self.depth_multiplier ** depth_for_calculation)
 
         # If actual depth exceeds max_calc_depth, we might apply a different rule.
@@ -84,7 +93,9 @@ class FractalRewardSystem:
         # Python floats handle large numbers, but for blockchain consistency, fixed-point arithmetic is better.
         # This is a simulation, so float is fine.
 
-        return round(final_reward, 8) # Round to a typical number of decimal places for crypto
+        final_reward = round(final_reward, 8) # Round to a typical number of decimal places for crypto
+        self._reward_table[depth_for_calculation] = final_reward
+        return final_reward
 
 
 if __name__ == '__main__':
@@ -1,7 +1,7 @@
 from typing import List, Tuple, Optional
 
 from fractal_blockchain.core.addressing import AddressedFractalCoordinate
-from fractal_blockchain.core.geometry_validator import is_valid_addressed_coordinate, get_neighbors
+from fractal_blockchain.core.geometry_validator import is_valid_addressed_coordinate, get_neighbors_cached
 
 # --- Configuration for Path Assessment ---
 BASE_PATH_REWARD = 100.0  # Base reward for any valid submitted path
@@ -65,7 +65,7 @@ class SierpinskiPathAssessor:
                 # Get neighbors of current_coord. Note: get_neighbors is currently a placeholder
                 # and might be very restrictive (e.g., only siblings).
                 # This will heavily influence what paths are considered "connected".
-                neighbors_of_current = get_neighbors(current_coord)
+                neighbors_of_current = get_neighbors_cached(current_coord)
 
                 if next_coord not in neighbors_of_current:
                     print(f"[PathAssessor] Path connectivity failed: {next_coord} is not a direct neighbor of {current_coord} (Neighbors: {neighbors_of_current}).")
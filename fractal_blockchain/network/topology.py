@@ -1,10 +1,11 @@
 # Fractal Network Topology Mapper
 
-from typing import List, Optional, Set, Any
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Any
 from fractal_blockchain.core.addressing import AddressedFractalCoordinate
 # For geometric relationships, we might use functions from geometry_validator or fractal_math
 from fractal_blockchain.core.mathematics.fractal_math import get_parent, get_children as get_solid_children_math
-from fractal_blockchain.core.geometry_validator import get_neighbors as get_geometric_adjacencies
+from fractal_blockchain.core.geometry_validator import get_neighbors_cached as get_geometric_adjacencies
 
 
 # Prompt 8: Create fractal network topology mapper.
@@ -31,6 +32,9 @@ class FractalTopologyMapper:
         self.max_network_depth = max_network_depth
         # In a real system, this might hold a list of active nodes and their fractal coordinates.
         self._active_nodes: Dict[AddressedFractalCoordinate, Any] = {} # Value could be node info
+        # Index of _active_nodes by depth, kept in sync by add/remove_network_node.
+        # Inner dicts are used as insertion-ordered sets.
+        self._nodes_by_depth: Dict[int, Dict[AddressedFractalCoordinate, None]] = defaultdict(dict)
 
     def add_network_node(self, coord: AddressedFractalCoordinate, node_info: Any = True):
         """Registers an active node at a given fractal coordinate."""
@@ -39,15 +43,82 @@ class FractalTopologyMapper:
             # print(f"Node at {coord} exceeds max_network_depth {self.max_network_depth}")
             return
         self._active_nodes[coord] = node_info
+        self._nodes_by_depth[coord.depth][coord] = None
 
     def remove_network_node(self, coord: AddressedFractalCoordinate):
         """Unregisters a node."""
         if coord in self._active_nodes:
             del self._active_nodes[coord]
+            del self._nodes_by_depth[coord.depth][coord]
 
     def get_active_nodes_at_depth(self, depth: int) -> List[AddressedFractalCoordinate]:
         """Returns a list of active nodes at a specific depth."""
-        return [coord for coord in self._active_nodes if coord.depth == depth]
+        return list(self._nodes_by_depth.get(depth, ()))
+
+    def _parent_peers(self, coord: AddressedFractalCoordinate) -> Set[AddressedFractalCoordinate]:
+        # Using fractal_math.get_parent which expects FractalCoordinate (implicitly solid path)
+        # If coord can be a void, its parent logic needs care.
+        # Assuming AddressedFractalCoordinate is compatible if path is solid.
+        peers: Set[AddressedFractalCoordinate] = set()
+        if coord.depth > 0 : # Genesis has no parent
+            parent_path = coord.path[:-1]
+            try:
+                peers.add(AddressedFractalCoordinate.get(coord.depth -1, parent_path))
+            except ValueError: pass # Invalid path for parent
+        return peers
+
+    def _child_peers(self, coord: AddressedFractalCoordinate) -> Set[AddressedFractalCoordinate]:
+        # Children can be solid (path elements 0,1,2) or void (path element 3)
+        # This applies whether the current 'coord' is solid or void.
+        # If 'coord' is solid, (coord.path,3) is its central void.
+        # If 'coord' is void, (coord.path,3) is the central void of its subdivision.
+        peers: Set[AddressedFractalCoordinate] = set()
+        if self.max_network_depth is not None and coord.depth + 1 > self.max_network_depth:
+            return peers
+        for i in range(4): # Try path extensions 0, 1, 2, 3 for children
+            child_path = coord.path + (i,)
+            try:
+                peers.add(AddressedFractalCoordinate.get(coord.depth + 1, child_path))
+            except ValueError:
+                pass # Should not happen if coord.path is valid and i is 0-3
+        return peers
+
+    def _sibling_peers(self, coord: AddressedFractalCoordinate) -> Set[AddressedFractalCoordinate]:
+        # Other children of the same parent.
+        peers: Set[AddressedFractalCoordinate] = set()
+        if coord.depth > 0:
+            parent_path = coord.path[:-1]
+            current_child_idx = coord.path[-1]
+
+            # Iterate through all possible child indices (0,1,2 for solid, 3 for void)
+            for i in range(4):
+                if i != current_child_idx:
+                    sibling_path = parent_path + (i,)
+                    try:
+                        peers.add(AddressedFractalCoordinate.get(coord.depth, sibling_path))
+                    except ValueError: pass
+        return peers
+
+    def _geometric_peers(self, coord: AddressedFractalCoordinate) -> Set[AddressedFractalCoordinate]:
+        # This is where true "Sierpinski pattern" connections would come from.
+        # The current get_geometric_adjacencies is a placeholder (returns siblings).
+        peers = set(get_geometric_adjacencies(coord)) # Already AddressedFractalCoordinates
+        peers.discard(coord)
+        return peers
+
+    def get_peer_breakdown(self, coord: AddressedFractalCoordinate) -> Dict[str, Set[AddressedFractalCoordinate]]:
+        """
+        Returns the potential peers of `coord` grouped by relationship, computed once:
+        {"parent": ..., "children": ..., "siblings": ..., "geometric": ...}.
+        Callers needing several views of the peer list can slice this instead of
+        calling get_potential_peers repeatedly with different flags.
+        """
+        return {
+            "parent": self._parent_peers(coord),
+            "children": self._child_peers(coord),
+            "siblings": self._sibling_peers(coord),
+            "geometric": self._geometric_peers(coord),
+        }
 
     def get_potential_peers(self, coord: AddressedFractalCoordinate,
                               include_parent: bool = True,
@@ -59,60 +130,17 @@ class FractalTopologyMapper:
         """
         Identifies potential peers for a node at `coord` based on fractal relationships.
         This is a high-level suggestion list; actual peering involves liveness and reachability.
+        Only the enabled relationship categories are computed.
         """
         potential_peers: Set[AddressedFractalCoordinate] = set()
-
-        # 1. Parent
         if include_parent:
-            # Using fractal_math.get_parent which expects FractalCoordinate (implicitly solid path)
-            # If coord can be a void, its parent logic needs care.
-            # Assuming AddressedFractalCoordinate is compatible if path is solid.
-            if coord.depth > 0 : # Genesis has no parent
-                parent_path = coord.path[:-1]
-                try:
-                    parent_coord = AddressedFractalCoordinate(coord.depth -1, parent_path)
-                    potential_peers.add(parent_coord)
-                except ValueError: pass # Invalid path for parent
-
-        # 2. Children
+            potential_peers |= self._parent_peers(coord)
         if include_children:
-            # Children can be solid (path elements 0,1,2) or void (path element 3)
-            # This applies whether the current 'coord' is solid or void.
-            # If 'coord' is solid, (coord.path,3) is its central void.
-            # If 'coord' is void, (coord.path,3) is the central void of its subdivision.
-            for i in range(4): # Try path extensions 0, 1, 2, 3 for children
-                child_path = coord.path + (i,)
-                try:
-                    child_coord = AddressedFractalCoordinate(coord.depth + 1, child_path)
-                    if self.max_network_depth is None or child_coord.depth <= self.max_network_depth:
-                        potential_peers.add(child_coord)
-                except ValueError:
-                    pass # Should not happen if coord.path is valid and i is 0-3
-
-        # 3. Siblings (other children of the same parent)
-        if include_siblings and coord.depth > 0:
-            parent_path = coord.path[:-1]
-            current_child_idx = coord.path[-1]
-
-            # Iterate through all possible child indices (0,1,2 for solid, 3 for void)
-            for i in range(4):
-                if i != current_child_idx:
-                    sibling_path = parent_path + (i,)
-                    try:
-                        sibling_coord = AddressedFractalCoordinate(coord.depth, sibling_path)
-                        potential_peers.add(sibling_coord)
-                    except ValueError: pass
-
-        # 4. Geometric Adjacencies (from geometry_validator placeholder)
-        # This is where true "Sierpinski pattern" connections would come from.
-        # The current get_geometric_adjacencies is a placeholder (returns solid siblings).
+            potential_peers |= self._child_peers(coord)
+        if include_siblings:
+            potential_peers |= self._sibling_peers(coord)
         if include_geometric_adjacencies:
-            adj_coords = get_geometric_adjacencies(coord) # This is the placeholder
-            for ac in adj_coords:
-                potential_peers.add(ac) # ac is already AddressedFractalCoordinate
-
-        # Filter out self, if present
-        potential_peers.discard(coord)
+            potential_peers |= self._geometric_peers(coord)
 
         # Further filtering: only include peers that are known active nodes (optional)
         # active_potential_peers = {p for p in potential_peers if p in self._active_nodes}
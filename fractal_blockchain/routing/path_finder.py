@@ -1,12 +1,13 @@
 # Fractal Path Finder using Dijkstra's Algorithm
 
 import heapq
-from typing import List, Dict, Tuple, Optional, Set
+from collections import deque
+from typing import Callable, Iterable, List, Dict, Tuple, Optional, Set
 
 from fractal_blockchain.core.addressing import AddressedFractalCoordinate
 # For neighbor identification, we use the function from geometry_validator.
 # The current version of get_neighbors in geometry_validator returns all siblings (solid and void).
-from fractal_blockchain.core.geometry_validator import get_neighbors
+from fractal_blockchain.core.geometry_validator import get_neighbors_cached
 
 # Prompt 5: Create fractal path finder.
 # - Fractal-aware routing: Dijkstra’s algorithm adapted for Sierpinski geometry.
@@ -17,6 +18,7 @@ from fractal_blockchain.core.geometry_validator import get_neighbors
 
 Path = List[AddressedFractalCoordinate]
 Cost = float # Using float for cost, could be int if only hop count.
+NeighborsFn = Callable[[AddressedFractalCoordinate], Iterable[AddressedFractalCoordinate]]
 
 # Define a cost function for moving between adjacent coordinates.
 # For now, let's assume a uniform cost of 1 (hop count).
@@ -35,10 +37,11 @@ def get_edge_cost(coord1: AddressedFractalCoordinate, coord2: AddressedFractalCo
 
 def find_path_dijkstra(start_coord: AddressedFractalCoordinate,
                        end_coord: AddressedFractalCoordinate,
-                       max_depth_for_pathfinding: Optional[int] = None) -> Optional[Path]:
+                       max_depth_for_pathfinding: Optional[int] = None,
+                       neighbors_fn: NeighborsFn = get_neighbors_cached) -> Optional[Path]:
     """
     Finds the shortest path between start_coord and end_coord using Dijkstra's algorithm.
-    The "graph" is dynamically explored using a neighbor function (get_geometric_neighbors).
+    The "graph" is dynamically explored using a neighbor function (`neighbors_fn`).
     Only considers non-void coordinates for path segments unless explicitly allowed by neighbor function.
 
     Args:
@@ -46,6 +49,8 @@ def find_path_dijkstra(start_coord: AddressedFractalCoordinate,
         end_coord: The target AddressedFractalCoordinate.
         max_depth_for_pathfinding: Optional maximum depth to explore for neighbors.
                                    If None, uses depth of start/end coordinates.
+        neighbors_fn: Returns the coordinates adjacent to a coordinate.
+                      Defaults to geometry_validator.get_neighbors_cached.
 
     Returns:
         A list of AddressedFractalCoordinates representing the path, or None if no path is found.
@@ -60,34 +65,32 @@ def find_path_dijkstra(start_coord: AddressedFractalCoordinate,
     if start_coord == end_coord:
         return [start_coord]
 
-    # Priority queue: stores (cost, coordinate_object)
-    # We store the object itself to avoid issues with tuple comparison if AddressedFractalCoordinate was mutable
-    # or had complex comparison. Since it's a NamedTuple, it's hashable and comparable.
-    pq: List[Tuple[Cost, AddressedFractalCoordinate]] = [(0.0, start_coord)]
+    # Coordinates get sequential integer ids on first sight; the per-node state lives in lists
+    # indexed by id, so each neighbor costs one coordinate-keyed lookup (id_of) per expansion.
+    id_of: Dict[AddressedFractalCoordinate, int] = {start_coord: 0}
+    coord_of: List[AddressedFractalCoordinate] = [start_coord]
+    cost_so_far: List[Cost] = [0.0] # cost to reach each id from the start
+    came_from: List[int] = [-1] # predecessor id on the best known path, -1 for the start
+    visited = bytearray(1) # 1 once an id has been popped with its final cost
 
-    # came_from: stores the predecessor of each coordinate in the shortest path
-    came_from: Dict[AddressedFractalCoordinate, Optional[AddressedFractalCoordinate]] = {start_coord: None}
-
-    # cost_so_far: stores the cost to reach each coordinate from the start
-    cost_so_far: Dict[AddressedFractalCoordinate, Cost] = {start_coord: 0.0}
-
-    # Set of visited coordinates to avoid reprocessing (optional, Dijkstra handles cycles with costs)
-    # visited: Set[AddressedFractalCoordinate] = set()
+    # Priority queue: stores (cost, id). Ids are unique per coordinate, so ties on cost are
+    # settled by an int comparison and coordinates are never compared.
+    pq: List[Tuple[Cost, int]] = [(0.0, 0)]
 
     while pq:
-        current_cost, current_coord = heapq.heappop(pq)
-
-        # if current_coord in visited: # Optional optimization
-        #     continue
-        # visited.add(current_coord)
+        current_cost, current_id = heapq.heappop(pq)
+        if visited[current_id]:
+            continue # Stale entry, a cheaper one was already processed
+        visited[current_id] = 1
+        current_coord = coord_of[current_id]
 
         if current_coord == end_coord:
             # Path found, reconstruct it
             path: Path = []
-            temp_coord: Optional[AddressedFractalCoordinate] = end_coord
-            while temp_coord is not None:
-                path.append(temp_coord)
-                temp_coord = came_from.get(temp_coord)
+            temp_id = current_id
+            while temp_id != -1:
+                path.append(coord_of[temp_id])
+                temp_id = came_from[temp_id]
             return path[::-1] # Reverse to get start -> end order
 
         # Consider depth limits for neighbor exploration
@@ -95,7 +98,7 @@ def find_path_dijkstra(start_coord: AddressedFractalCoordinate,
         # Current get_geometric_neighbors doesn't take max_depth. This is a simplification.
         # A more robust get_neighbors would need to handle depth constraints.
 
-        neighbors = get_neighbors(current_coord) # Call the imported get_neighbors
+        neighbors = neighbors_fn(current_coord)
 
         for neighbor_coord in neighbors:
             if neighbor_coord.is_void_path(): # Typically, don't route through voids unless specified
@@ -105,16 +108,85 @@ def find_path_dijkstra(start_coord: AddressedFractalCoordinate,
             if max_depth_for_pathfinding is not None and neighbor_coord.depth > max_depth_for_pathfinding:
                 continue
 
-            new_cost = cost_so_far[current_coord] + get_edge_cost(current_coord, neighbor_coord)
+            new_cost = current_cost + get_edge_cost(current_coord, neighbor_coord)
+
+            neighbor_id = id_of.get(neighbor_coord)
+            if neighbor_id is None:
+                neighbor_id = len(coord_of)
+                id_of[neighbor_coord] = neighbor_id
+                coord_of.append(neighbor_coord)
+                cost_so_far.append(new_cost)
+                came_from.append(current_id)
+                visited.append(0)
+            elif visited[neighbor_id] or new_cost >= cost_so_far[neighbor_id]:
+                continue
+            else:
+                cost_so_far[neighbor_id] = new_cost
+                came_from[neighbor_id] = current_id
+            heapq.heappush(pq, (new_cost, neighbor_id))
+
+    return None # No path found
+
+
+def find_path_bfs(start_coord: AddressedFractalCoordinate,
+                  end_coord: AddressedFractalCoordinate,
+                  max_depth_for_pathfinding: Optional[int] = None,
+                  neighbors_fn: NeighborsFn = get_neighbors_cached) -> Optional[Path]:
+    """
+    Finds the fewest-hop path between start_coord and end_coord using breadth-first search.
+    Equivalent to find_path_dijkstra while every edge costs the same (see get_edge_cost),
+    but uses a FIFO queue instead of a heap and stops as soon as end_coord is discovered.
+
+    Args and return value are the same as for find_path_dijkstra.
+    """
+    if start_coord.is_void_path() or end_coord.is_void_path():
+        return None
+
+    if start_coord == end_coord:
+        return [start_coord]
+
+    # came_from doubles as the visited set.
+    came_from: Dict[AddressedFractalCoordinate, Optional[AddressedFractalCoordinate]] = {start_coord: None}
+    queue = deque([start_coord])
 
-            if neighbor_coord not in cost_so_far or new_cost < cost_so_far[neighbor_coord]:
-                cost_so_far[neighbor_coord] = new_cost
-                came_from[neighbor_coord] = current_coord
-                heapq.heappush(pq, (new_cost, neighbor_coord))
+    while queue:
+        current_coord = queue.popleft()
+
+        for neighbor_coord in neighbors_fn(current_coord):
+            if neighbor_coord in came_from:
+                continue
+            if neighbor_coord.is_void_path():
+                continue
+            if max_depth_for_pathfinding is not None and neighbor_coord.depth > max_depth_for_pathfinding:
+                continue
+
+            came_from[neighbor_coord] = current_coord
+            if neighbor_coord == end_coord:
+                path: Path = []
+                temp_coord: Optional[AddressedFractalCoordinate] = end_coord
+                while temp_coord is not None:
+                    path.append(temp_coord)
+                    temp_coord = came_from[temp_coord]
+                return path[::-1]
+            queue.append(neighbor_coord)
 
     return None # No path found
 
 
+def find_shortest_path(start_coord: AddressedFractalCoordinate,
+                       end_coord: AddressedFractalCoordinate,
+                       max_depth_for_pathfinding: Optional[int] = None,
+                       neighbors_fn: NeighborsFn = get_neighbors_cached,
+                       *, uniform_cost: bool = True) -> Optional[Path]:
+    """
+    Finds the shortest path between two coordinates.
+    Uses find_path_bfs while edge costs are uniform (the current get_edge_cost),
+    and find_path_dijkstra when uniform_cost is False.
+    """
+    find_path = find_path_bfs if uniform_cost else find_path_dijkstra
+    return find_path(start_coord, end_coord, max_depth_for_pathfinding, neighbors_fn)
+
+
 if __name__ == '__main__':
     print("Fractal Path Finder Demo")
 
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make the fractal_blockchain package importable for every test module, configured once at collection.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
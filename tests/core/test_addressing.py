@@ -43,6 +43,26 @@ class TestFractalAddressing(unittest.TestCase):
         with self.assertRaises(ValueError):
             AddressedFractalCoordinate(depth=2, path=(0,))
 
+    def test_is_void_path_cached_and_replace(self):
+        afc_solid = AddressedFractalCoordinate(depth=2, path=(0, 1))
+        self.assertFalse(afc_solid.is_void_path())
+        # _replace/_make skip __new__, so the void flag must still be derived from the new path
+        afc_void = afc_solid._replace(path=(0, 3))
+        self.assertTrue(afc_void.is_void_path())
+        self.assertFalse(afc_void.is_solid_path())
+        self.assertFalse(AddressedFractalCoordinate._make((1, (2,))).is_void_path())
+
+    def test_get_returns_interned_instance(self):
+        afc = AddressedFractalCoordinate.get(2, (0, 1))
+        self.assertEqual(afc, AddressedFractalCoordinate(depth=2, path=(0, 1)))
+        self.assertIs(AddressedFractalCoordinate.get(2, (0, 1)), afc)
+        self.assertIs(AddressedFractalCoordinate.get(2, [0, 1]), afc) # path is normalised to a tuple
+
+        with self.assertRaises(ValueError):
+            AddressedFractalCoordinate.get(1, (4,))
+        with self.assertRaises(ValueError):
+            AddressedFractalCoordinate.get(2, (0,))
+
     def test_coord_to_string(self):
         fc_orig = FractalCoordinate(depth=2, path=(0,1)) # Original type
         afc_solid = AddressedFractalCoordinate(depth=2, path=(0, 1))
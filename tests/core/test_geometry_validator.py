@@ -8,6 +8,7 @@ from fractal_blockchain.core.geometry_validator import (
     is_valid_addressed_coordinate,
     get_vertices_for_addressed_coord,
     get_neighbors,
+    get_neighbors_cached,
     is_orphaned, # Currently relies on is_valid_addressed_coordinate
     is_on_boundary
 )
@@ -107,6 +108,14 @@ class TestGeometryValidator(unittest.TestCase):
         neighbors_d2_p01 = get_neighbors(d2_p01)
         self.assertCountEqual(neighbors_d2_p01, expected_neighbors_d2_p01)
 
+    def test_get_neighbors_cached(self):
+        d2_p01 = AddressedFractalCoordinate(2, (0,1))
+        cached = get_neighbors_cached(d2_p01)
+        self.assertIsInstance(cached, tuple)
+        self.assertCountEqual(cached, get_neighbors(d2_p01))
+        # A second lookup is served from the cache
+        self.assertIs(get_neighbors_cached(AddressedFractalCoordinate(2, (0,1))), cached)
+
     def test_is_orphaned_placeholder(self):
         # Placeholder currently just checks is_valid_addressed_coordinate
         # Valid coordinate
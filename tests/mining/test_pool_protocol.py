@@ -1,25 +1,72 @@
 import unittest
 from unittest.mock import MagicMock
-import sys
-import os
 import time
+import io
+import contextlib
+import threading
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
+from fractal_blockchain.mining import pool_protocol
 from fractal_blockchain.mining.pool_protocol import FractalMiningPool, PoolShare, MinerContribution, DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX
-from fractal_blockchain.mining.reward_system import FractalRewardSystem
-from fractal_blockchain.mining.difficulty_adjuster import DifficultyAdjuster, TARGET_BLOCK_TIME_SECONDS, DIFFICULTY_ADJUSTMENT_INTERVAL_BLOCKS
 from fractal_blockchain.core.addressing import AddressedFractalCoordinate
 
+# Share hashes that meet the pool's default difficulty prefix, built once at import.
+_VALID_HASHES = tuple(DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX + h for h in ("hash", "h1", "h2", "h3", "h_r1m1", "h_r2m1"))
+_HASH, _HASH_H1, _HASH_H2, _HASH_H3, _HASH_R1M1, _HASH_R2M1 = _VALID_HASHES
+
+# AddressedFractalCoordinate is an immutable NamedTuple, so these are safe to share across tests.
+_COORD_D0 = AddressedFractalCoordinate(depth=0, path=())
+_COORD_D1 = AddressedFractalCoordinate(depth=1, path=(0,))
+_COORD_D2 = AddressedFractalCoordinate(depth=2, path=(0,0))
+
+
+def _bulk_submit(pool, items):
+    """Submits (miner_id, coord, nonce, mined_hash) tuples to the pool, binding submit_share once."""
+    submit = pool.submit_share
+    for miner_id, coord, nonce, mined_hash in items:
+        submit(miner_id, coord, nonce, mined_hash)
+
+
+class _ScanCountingList(list):
+    """List that counts reads of existing elements (iteration, indexing, membership, length)."""
+    scans = 0
+
+    def __iter__(self):
+        self.scans += 1
+        return super().__iter__()
+
+    def __contains__(self, item):
+        self.scans += 1
+        return super().__contains__(item)
+
+    def __getitem__(self, index):
+        self.scans += 1
+        return super().__getitem__(index)
+
+    def __len__(self):
+        self.scans += 1
+        return super().__len__()
+
+
+class _RewardStub:
+    """Minimal stand-in for FractalRewardSystem: only the method the pool calls is mocked."""
+    def __init__(self, ret: float = 100.0):
+        self.calculate_block_reward = MagicMock(return_value=ret)
+
+
+class _DiffStub:
+    """Stand-in for DifficultyAdjuster: the pool stores it but no longer consults it, so nothing is mocked."""
+
+
 class TestFractalMiningPool(unittest.TestCase):
 
-    def setUp(self):
-        self.mock_reward_system = MagicMock(spec=FractalRewardSystem)
-        self.mock_difficulty_adjuster = MagicMock(spec=DifficultyAdjuster)
+    coord_d0 = _COORD_D0
+    coord_d1 = _COORD_D1
+    coord_d2 = _COORD_D2
 
-        # Configure default return values for mocks to avoid TypeErrors if methods are called unexpectedly
-        self.mock_reward_system.calculate_block_reward.return_value = 100.0 # Default block reward for tests
-        self.mock_difficulty_adjuster.get_current_difficulty.return_value = 10.0 # Default network difficulty metric
+    def setUp(self):
+        # The reward stub returns a default block reward of 100.0
+        self.mock_reward_system = _RewardStub()
+        self.mock_difficulty_adjuster = _DiffStub()
 
         self.pool = FractalMiningPool(
             reward_system=self.mock_reward_system,
@@ -28,10 +75,6 @@ class TestFractalMiningPool(unittest.TestCase):
         self.pool.register_miner("miner1")
         self.pool.register_miner("miner2")
 
-        self.coord_d0 = AddressedFractalCoordinate(depth=0, path=())
-        self.coord_d1 = AddressedFractalCoordinate(depth=1, path=(0,))
-        self.coord_d2 = AddressedFractalCoordinate(depth=2, path=(0,0))
-
     def test_miner_registration(self):
         self.assertIn("miner1", self.pool.miners)
         self.assertIsInstance(self.pool.miners["miner1"], MinerContribution)
@@ -40,16 +83,20 @@ class TestFractalMiningPool(unittest.TestCase):
         self.assertEqual(len(self.pool.miners), 2) # Still 2 miners
 
     def test_submit_valid_share(self):
-        # Mock calculate_share_weight to return a predictable weight
-        self.pool.calculate_share_weight = MagicMock(return_value=2.5)
+        # Replace calculate_share_weight with a spy returning a predictable weight
+        calls = []
+        def _spy(coord):
+            calls.append(coord)
+            return 2.5
+        self.pool.calculate_share_weight = _spy
 
-        share_accepted = self.pool.submit_share("miner1", self.coord_d1, 123, DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX + "hash")
+        share_accepted = self.pool.submit_share("miner1", self.coord_d1, 123, _HASH)
 
         self.assertTrue(share_accepted)
         self.assertEqual(len(self.pool.current_round_shares), 1)
         self.assertEqual(self.pool.miners["miner1"].total_weighted_shares, 2.5)
         self.assertEqual(self.pool.total_weighted_shares_this_round, 2.5)
-        self.pool.calculate_share_weight.assert_called_with(self.coord_d1)
+        self.assertEqual(calls, [self.coord_d1])
 
     def test_submit_invalid_share_wrong_difficulty(self):
         share_accepted = self.pool.submit_share("miner1", self.coord_d0, 124, "1hash_nodiffprefix") # Does not meet "0" prefix
@@ -58,43 +105,33 @@ class TestFractalMiningPool(unittest.TestCase):
         self.assertEqual(self.pool.miners["miner1"].total_weighted_shares, 0)
 
     def test_submit_share_unregistered_miner(self):
-        share_accepted = self.pool.submit_share("miner3_unreg", self.coord_d0, 125, DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX + "hash")
+        share_accepted = self.pool.submit_share("miner3_unreg", self.coord_d0, 125, _HASH)
         self.assertFalse(share_accepted)
 
     def test_calculate_share_weight_increases_with_depth(self):
-        # This tests the default implementation of calculate_share_weight
-        # If it's mocked in other tests, ensure this test uses the real one or a controlled mock.
-        pool_for_weight_test = FractalMiningPool(self.mock_reward_system, self.mock_difficulty_adjuster)
-
-        # Mock get_current_difficulty to control its output for weight calculation
-        def mock_get_diff(depth, coord_str):
-            return 1.0 + depth * 10 # e.g., D0=1, D1=11, D2=21
-        pool_for_weight_test.difficulty_adjuster.get_current_difficulty = MagicMock(side_effect=mock_get_diff)
-
-        weight_d0 = pool_for_weight_test.calculate_share_weight(self.coord_d0)
-        weight_d1 = pool_for_weight_test.calculate_share_weight(self.coord_d1)
-        weight_d2 = pool_for_weight_test.calculate_share_weight(self.coord_d2)
+        # self.pool's calculate_share_weight is not mocked, so this exercises the
+        # default logic: 1.0 + depth * 0.5.
+        for coord, expected in [(self.coord_d0, 1.0), (self.coord_d1, 1.5), (self.coord_d2, 2.0)]:
+            with self.subTest(depth=coord.depth):
+                self.assertAlmostEqual(self.pool.calculate_share_weight(coord), expected)
 
-        # Default logic: 1.0 + depth * 0.5 OR uses difficulty_adjuster.
-        # The current pool_protocol.py's calculate_share_weight uses: 1.0 + (share_coord.depth * 0.5)
-        # Let's test that default logic if not overridden by mock.
-        # For self.pool, it's not mocked in setUp, so it uses the real one.
-        weight_d0_actual = self.pool.calculate_share_weight(self.coord_d0)
-        weight_d1_actual = self.pool.calculate_share_weight(self.coord_d1)
-        weight_d2_actual = self.pool.calculate_share_weight(self.coord_d2)
-
-        self.assertAlmostEqual(weight_d0_actual, 1.0 + 0 * 0.5)
-        self.assertAlmostEqual(weight_d1_actual, 1.0 + 1 * 0.5)
-        self.assertAlmostEqual(weight_d2_actual, 1.0 + 2 * 0.5)
-        self.assertTrue(weight_d2_actual > weight_d1_actual > weight_d0_actual)
 
+    def test_calculate_share_weight_uses_table(self):
+        for d in range(32):
+            with self.subTest(depth=d):
+                self.assertEqual(pool_protocol._SHARE_WEIGHT_TABLE[d], 1.0 + d * 0.5)
+        # Depths past the table fall back to the same formula
+        deep = len(pool_protocol._SHARE_WEIGHT_TABLE) + 5
+        self.assertEqual(self.pool.calculate_share_weight(AddressedFractalCoordinate(depth=deep, path=(0,) * deep)), 1.0 + deep * 0.5)
 
     def test_block_found_and_reward_distribution_proportional(self):
         # Miner1: 2 shares at depth0 (weight 1.0 each default logic) = 2.0
         # Miner2: 1 share at depth2 (weight 1.0 + 2*0.5 = 2.0 default logic) = 2.0
-        self.pool.submit_share("miner1", self.coord_d0, 1, DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX + "h1")
-        self.pool.submit_share("miner1", self.coord_d0, 2, DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX + "h2")
-        self.pool.submit_share("miner2", self.coord_d2, 3, DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX + "h3")
+        _bulk_submit(self.pool, [
+            ("miner1", self.coord_d0, 1, _HASH_H1),
+            ("miner1", self.coord_d0, 2, _HASH_H2),
+            ("miner2", self.coord_d2, 3, _HASH_H3),
+        ])
 
         total_shares_weight = (1.0 + 0*0.5)*2 + (1.0 + 2*0.5) # 2*1.0 + 2.0 = 4.0
         self.assertAlmostEqual(self.pool.total_weighted_shares_this_round, total_shares_weight)
@@ -139,17 +176,97 @@ class TestFractalMiningPool(unittest.TestCase):
 
     def test_payouts_are_cumulative(self):
         # Round 1
-        self.pool.submit_share("miner1", self.coord_d0, 1, DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX + "h_r1m1")
+        self.pool.submit_share("miner1", self.coord_d0, 1, _HASH_R1M1)
         self.pool.block_found_by_pool(self.coord_d0, "miner1") # Reward 100, all to miner1
         self.assertAlmostEqual(self.pool.get_miner_payouts("miner1"), 100.0)
 
         # Round 2
         self.mock_reward_system.calculate_block_reward.return_value = 50.0 # New block reward for round 2
-        self.pool.submit_share("miner1", self.coord_d1, 2, DEFAULT_POOL_SHARE_DIFFICULTY_PREFIX + "h_r2m1")
+        self.pool.submit_share("miner1", self.coord_d1, 2, _HASH_R2M1)
         self.pool.block_found_by_pool(self.coord_d1, "miner1") # Reward 50, all to miner1
 
         self.assertAlmostEqual(self.pool.get_miner_payouts("miner1"), 100.0 + 50.0) # Cumulative
 
+    def test_submit_share_does_not_scan_round_shares(self):
+        # Guards against submit_share regressing to a scan over current_round_shares,
+        # which would make a round quadratic in its share count.
+        self.pool.calculate_share_weight = MagicMock(return_value=1.0)
+        self.pool.current_round_shares = _ScanCountingList()
+
+        with contextlib.redirect_stdout(io.StringIO()): # submit_share logs every accepted share
+            _bulk_submit(self.pool, [("miner1", self.coord_d0, i, _HASH) for i in range(1000)])
+
+        self.assertEqual(self.pool.current_round_shares.scans, 0)
+        self.assertEqual(list.__len__(self.pool.current_round_shares), 1000)
+
+    def test_payout_1000_miners_sums_to_block_reward(self):
+        miner_ids = [f"m{i}" for i in range(1000)]
+        self.pool.calculate_share_weight = MagicMock(return_value=1.0)
+        self.mock_reward_system.calculate_block_reward.return_value = 1000.0
+
+        with contextlib.redirect_stdout(io.StringIO()): # Registration, shares and payouts all log per miner
+            for miner_id in miner_ids:
+                self.pool.register_miner(miner_id)
+            _bulk_submit(self.pool, [(miner_id, self.coord_d0, i, _HASH) for i, miner_id in enumerate(miner_ids)])
+            self.pool.block_found_by_pool(self.coord_d0, "m0")
+
+        payouts = [self.pool.get_miner_payouts(miner_id) for miner_id in miner_ids]
+        self.assertAlmostEqual(sum(payouts), 1000.0, places=4)
+        self.assertTrue(all(abs(p - 1.0) < 1e-9 for p in payouts))
+
+    def test_concurrent_submit_share(self):
+        self.pool.calculate_share_weight = MagicMock(return_value=1.0)
+
+        def worker(tag):
+            for i in range(500):
+                self.pool.submit_share("miner1", self.coord_d0, tag * 10000 + i, _HASH)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(self.pool.current_round_shares), 4000)
+        self.assertEqual(self.pool.miners["miner1"].total_weighted_shares, 4000.0)
+        self.assertEqual(self.pool.total_weighted_shares_this_round, 4000.0)
+
+    def test_concurrent_submit_share_during_block_found(self):
+        self.pool.calculate_share_weight = MagicMock(return_value=1.0)
+        closed_rounds = []
+        start_new_round = self.pool._start_new_round
+        def _recording_start_new_round():
+            closed = start_new_round()
+            closed_rounds.append(closed)
+            return closed
+        self.pool._start_new_round = _recording_start_new_round
+
+        accepted = []
+        def worker(tag):
+            miner_id = f"c{tag}"
+            self.pool.register_miner(miner_id)
+            accepted.append(sum(self.pool.submit_share(miner_id, self.coord_d0, tag * 10000 + i, _HASH) for i in range(500)))
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+        with contextlib.redirect_stdout(io.StringIO()):
+            for t in threads:
+                t.start()
+            while any(t.is_alive() for t in threads):
+                self.pool.block_found_by_pool(self.coord_d0, None)
+            for t in threads:
+                t.join()
+            self.pool.block_found_by_pool(self.coord_d0, None)
+
+        # Every accepted share is counted in exactly one closed round, and each round's
+        # per-miner weights add up to its total.
+        self.assertEqual(sum(accepted), 4000)
+        self.assertEqual(sum(total for total, _ in closed_rounds), 4000.0)
+        for total, weights in closed_rounds:
+            self.assertEqual(sum(weights.values()), total)
+        paid_rounds = sum(1 for total, _ in closed_rounds if total > 0)
+        self.assertAlmostEqual(sum(self.pool.payouts.values()), 100.0 * paid_rounds, places=6)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,11 @@
+import hashlib
 import unittest
+from unittest.mock import patch
+from fractal_blockchain.structures import merkle
 from fractal_blockchain.structures.merkle import (
-    hash_data, hash_pair,
-    FractalMerkleNode, build_merkle_tree_from_hashes,
-    FractalLevelMerkleTree
+    hash_bytes, hash_data, hash_pair, hash_pair_bytes,
+    FractalMerkleNode, build_merkle_root, build_merkle_tree_from_hashes,
+    FractalLevelMerkleTree, BatchMerkleProof, MerkleCache, PackedMerkleTree, _coord_prefix, _hash_level, _merkle_root_digest
 )
 from fractal_blockchain.core.addressing import AddressedFractalCoordinate
 
@@ -19,6 +22,12 @@ class TestMerkleTree(unittest.TestCase):
         h_bytes = hash_data(b"hello bytes")
         self.assertEqual(len(h_bytes), 64)
 
+        # Raw digest form
+        raw = hash_bytes("hello")
+        self.assertEqual(len(raw), 32)
+        self.assertEqual(raw.hex(), h1)
+        self.assertEqual(hash_bytes(b"hello"), raw)
+
     def test_hash_pair(self):
         h1 = hash_data("a")
         h2 = hash_data("b")
@@ -30,6 +39,22 @@ class TestMerkleTree(unittest.TestCase):
         self.assertNotEqual(pair_hash1, pair_hash_rev) # Order matters
         self.assertEqual(len(pair_hash1), 64)
 
+        # Pairs hash the 64 raw digest bytes, not the hex text
+        raw1, raw2 = bytes.fromhex(h1), bytes.fromhex(h2)
+        pair_raw = hash_pair_bytes(raw1, raw2)
+        self.assertEqual(len(pair_raw), 32)
+        self.assertEqual(pair_raw, hashlib.sha256(raw1 + raw2).digest())
+        self.assertEqual(pair_hash1, pair_raw.hex())
+
+    def test_hash_level(self):
+        digests = [hash_bytes(f"item{i}") for i in range(4)]
+        self.assertEqual(_hash_level(digests),
+                         [hash_pair_bytes(digests[0], digests[1]), hash_pair_bytes(digests[2], digests[3])])
+        self.assertEqual(_hash_level([]), [])
+        # An odd last digest is paired with itself
+        self.assertEqual(_hash_level(digests[:3]),
+                         [hash_pair_bytes(digests[0], digests[1]), hash_pair_bytes(digests[2], digests[2])])
+
     def test_build_merkle_tree_from_hashes(self):
         # No hashes
         self.assertIsNone(build_merkle_tree_from_hashes([]))
@@ -88,6 +113,83 @@ class TestMerkleTree(unittest.TestCase):
         self.assertEqual(root_four.value, expected_root_val_four)
 
 
+    def test_build_merkle_root(self):
+        self.assertIsNone(build_merkle_root([]))
+        hashes = [hash_data(f"item{i}") for i in range(9)]
+        for n in range(1, len(hashes) + 1):
+            with self.subTest(leaves=n):
+                self.assertEqual(build_merkle_root(hashes[:n]), build_merkle_tree_from_hashes(hashes[:n]).value)
+
+    def test_non_hex_leaves(self):
+        # A single leaf is never hashed, so both root builders return it unchanged
+        self.assertEqual(build_merkle_tree_from_hashes(["tx1"]).value, "tx1")
+        self.assertEqual(build_merkle_root(["tx1"]), "tx1")
+        # Anything that is hashed must be a hex digest, and every entry point agrees
+        with self.assertRaises(ValueError):
+            hash_pair("tx1", "tx2")
+        with self.assertRaises(ValueError):
+            build_merkle_tree_from_hashes(["tx1", "tx2"])
+        with self.assertRaises(ValueError):
+            build_merkle_root(["tx1", "tx2"])
+
+    def test_merkle_root_digest_matches_tree(self):
+        hashes = [hash_data(f"item{i}") for i in range(9)]
+        for n in range(1, len(hashes) + 1):
+            with self.subTest(leaves=n):
+                root = _merkle_root_digest([bytes.fromhex(h) for h in hashes[:n]])
+                self.assertEqual(root.hex(), build_merkle_tree_from_hashes(hashes[:n]).value)
+
+    def test_merkle_cache(self):
+        cache = MerkleCache(maxsize=2)
+        digests = [hash_bytes(f"item{i}") for i in range(3)]
+        root = cache.get_root(digests)
+        self.assertEqual(root, _merkle_root_digest(digests))
+        self.assertIs(cache.get_root(list(digests)), root) # Hit on equal content
+        self.assertNotEqual(cache.get_root(digests[::-1]), root) # Order is part of the key
+
+        # Least recently used entry is evicted beyond maxsize
+        cache.get_root(digests[:2])
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(b"".join(digests), cache._roots)
+
+    def test_packed_merkle_tree(self):
+        h = [hash_data(f"item{i}") for i in range(9)]
+        for n in range(1, len(h) + 1):
+            with self.subTest(leaves=n):
+                packed = PackedMerkleTree(h[:n])
+                self.assertEqual(packed.root, build_merkle_tree_from_hashes(h[:n]).value)
+                self.assertEqual(packed.leaf_count, n)
+                self.assertEqual(len(packed.values), 32 * sum(packed.level_sizes))
+
+        # Three leaves: [h0, h1, h2, h2] -> [P01, P22] -> [R]
+        packed_three = PackedMerkleTree(h[:3])
+        self.assertEqual(packed_three.level_sizes, [4, 2, 1])
+        self.assertEqual(packed_three.height, 2)
+        self.assertEqual(packed_three.node_value(0, 3), h[2]) # Duplicated last leaf
+        self.assertEqual(packed_three.node_value(1, 1), hash_pair(h[2], h[2]))
+        self.assertEqual(packed_three.node_digest(0, 0), bytes.fromhex(h[0]))
+        with self.assertRaises(IndexError):
+            packed_three.node_value(1, 2)
+        # The buffer is allocated once and pinned by its read-only view
+        with self.assertRaises(BufferError):
+            packed_three.values.extend(bytes(32))
+
+        with self.assertRaises(ValueError):
+            PackedMerkleTree([])
+
+    def test_packed_merkle_tree_proofs_match_node_tree(self):
+        manager = FractalLevelMerkleTree()
+        h = [hash_data(f"item{i % 5}") for i in range(9)] # Repeated leaves prove at their leftmost position
+        for n in range(1, len(h) + 1):
+            packed = PackedMerkleTree(h[:n])
+            root_node = build_merkle_tree_from_hashes(h[:n])
+            for leaf in h[:n]:
+                with self.subTest(leaves=n, leaf=leaf[:8]):
+                    proof = packed.generate_merkle_proof(leaf)
+                    self.assertEqual(proof, manager.generate_merkle_proof(leaf, root_node))
+                    self.assertTrue(manager.verify_merkle_proof(leaf, proof, packed.root))
+        self.assertIsNone(packed.generate_merkle_proof(hash_data("not_in_tree")))
+
     def test_fractal_level_merkle_tree_get_data_hash_for_coord(self):
         manager = FractalLevelMerkleTree()
         coord = AddressedFractalCoordinate(1, (0,))
@@ -97,6 +199,39 @@ class TestMerkleTree(unittest.TestCase):
         expected_hash_input = f"d{coord.depth}p{''.join(map(str, coord.path))}{data}"
         self.assertEqual(h, hash_data(expected_hash_input))
 
+        # A second payload reuses the cached coordinate prefix without corrupting it
+        self.assertEqual(manager.get_data_hash_for_coord(coord, "other"), hash_data("d1p0other"))
+        self.assertEqual(manager.get_data_hash_for_coord(coord, data), h)
+
+        # A fresh tree reuses the module-level serialized prefix
+        self.assertEqual(_coord_prefix(1, (0,)), b"d1p0")
+        hits = _coord_prefix.cache_info().hits
+        self.assertEqual(FractalLevelMerkleTree().get_data_hash_for_coord(coord, data), h)
+        self.assertEqual(_coord_prefix.cache_info().hits, hits + 1)
+
+    def test_fractal_level_merkle_tree_hash_algo(self):
+        self.assertEqual(FractalLevelMerkleTree().hash_algo, "sha256")
+        with self.assertRaises(ValueError):
+            FractalLevelMerkleTree(hash_algo="md5")
+        with self.assertRaises(ValueError):
+            hash_data("a", algo="md5")
+        if merkle.blake3 is None:
+            with self.assertRaises(ValueError):
+                FractalLevelMerkleTree(hash_algo="blake3")
+
+    @unittest.skipIf(merkle.blake3 is None, "optional blake3 package not installed")
+    def test_fractal_level_merkle_tree_blake3(self):
+        manager = FractalLevelMerkleTree(hash_algo="blake3")
+        coord = AddressedFractalCoordinate(1, (0,))
+        self.assertEqual(manager.get_data_hash_for_coord(coord, "x"), hash_data("d1p0x", algo="blake3"))
+
+        roots = [hash_data(f"r{i}", algo="blake3") for i in range(3)]
+        b3 = lambda data: merkle.blake3.blake3(data).digest()
+        raw = [bytes.fromhex(r) for r in roots]
+        expected = b3(b3(raw[0] + raw[1]) + b3(raw[2] + raw[2])).hex()
+        self.assertEqual(manager.update_merkle_root_for_void_coordinator(AddressedFractalCoordinate(1, (3,)), roots),
+                         expected)
+
     def test_fractal_level_merkle_tree_calculate_merkle_root_for_children(self):
         manager = FractalLevelMerkleTree()
         parent = AddressedFractalCoordinate(0, tuple())
@@ -149,6 +284,26 @@ class TestMerkleTree(unittest.TestCase):
 
         self.assertIsNone(manager.update_merkle_root_for_void_coordinator(void_coord, []))
 
+        # Every unrolled size, and the generic path beyond it, matches the full tree build
+        roots = [hash_data(f"r{i}") for i in range(6)]
+        for n in range(1, len(roots) + 1):
+            with self.subTest(sub_roots=n):
+                self.assertEqual(manager.update_merkle_root_for_void_coordinator(void_coord, roots[:n]),
+                                 build_merkle_tree_from_hashes(roots[:n]).value)
+
+    def test_build_many(self):
+        leaf_lists = [[hash_data(f"tree{t}_item{i}") for i in range(t)] for t in range(6)]
+        expected = [None] + [build_merkle_tree_from_hashes(leaves).value for leaves in leaf_lists[1:]]
+
+        # In-process (below threshold) and across worker processes
+        self.assertEqual(FractalLevelMerkleTree.build_many(leaf_lists), expected)
+        self.assertEqual(FractalLevelMerkleTree.build_many(leaf_lists, workers=2, parallel_leaf_threshold=1), expected)
+
+        # The cut-over counts leaves, not trees: 64 four-leaf trees stay in-process
+        small_trees = [leaf_lists[4]] * 64
+        with patch.object(merkle, "ProcessPoolExecutor", side_effect=AssertionError("pool started")):
+            self.assertEqual(FractalLevelMerkleTree.build_many(small_trees, workers=4), [expected[4]] * 64)
+
     def test_verify_merkle_proof(self):
         manager = FractalLevelMerkleTree()
         # Data: h0, h1, h2, h3
@@ -171,6 +326,10 @@ class TestMerkleTree(unittest.TestCase):
             (p23, "right")    # Hash p01 with p23 (p01 is left child of root_val) -> root_val
         ]
         self.assertTrue(manager.verify_merkle_proof(h[0], proof_h0, root_val))
+        # The verifier folds raw digests; the same fold by hand gives the hex root
+        raw = [bytes.fromhex(x) for x in h]
+        raw_root = hash_pair_bytes(hash_pair_bytes(raw[0], raw[1]), hash_pair_bytes(raw[2], raw[3]))
+        self.assertEqual(raw_root.hex(), root_val)
 
         # Proof for h[2] (item2)
         # Sibling h[3] is to the right. Sibling p01 is to the left.
@@ -195,6 +354,12 @@ class TestMerkleTree(unittest.TestCase):
         with self.assertRaises(ValueError):
             manager.verify_merkle_proof(h[0], [(h[1], "up")], root_val)
 
+        # Hashes that are not hex digests fail verification instead of raising
+        for leaf, malformed in ((h[0], [("not-hex", "right")]), (h[0], [(h[1], "right"), (None, "right")]),
+                                ("not-hex", proof_h0)):
+            with self.subTest(leaf=leaf, proof=malformed):
+                self.assertFalse(manager.verify_merkle_proof(leaf, malformed, root_val))
+
 
     def test_generate_merkle_proof(self): # Renamed from test_generate_merkle_proof_placeholder
         manager = FractalLevelMerkleTree()
@@ -283,6 +448,60 @@ class TestMerkleTree(unittest.TestCase):
         proof_empty_tree = manager.generate_merkle_proof(h0, None)
         self.assertIsNone(proof_empty_tree)
 
+        # Each tree is indexed once and reused; returned proofs are copies of the index entries
+        self.assertIn(root_four_leaves_node, manager._proof_index)
+        proof_h0_in_four.append(("tampered", "left"))
+        self.assertEqual(manager.generate_merkle_proof(h0, root_four_leaves_node), expected_proof_h0_in_four)
+
+    def test_batch_merkle_proof(self):
+        manager = FractalLevelMerkleTree()
+        h = [hash_data(f"item{i}") for i in range(4)]
+        root = build_merkle_tree_from_hashes(h)
+        p01 = hash_pair(h[0], h[1])
+        p23 = hash_pair(h[2], h[3])
+
+        # h0 and h2: h1 and h3 are needed, P01 and P23 are then derivable
+        proof = manager.generate_batch_proof([h[0], h[2]], root)
+        self.assertEqual(proof, BatchMerkleProof(2, [0, 2], [h[1], h[3]]))
+        self.assertTrue(manager.verify_batch_proof([h[0], h[2]], proof, root.value))
+
+        # h0 and h1: only P23 is needed, versus four hashes for two single proofs
+        proof_01 = manager.generate_batch_proof([h[0], h[1]], root)
+        self.assertEqual(proof_01.copath, [p23])
+        self.assertTrue(manager.verify_batch_proof([h[0], h[1]], proof_01, root.value))
+
+        # Every leaf: nothing else is needed
+        proof_all = manager.generate_batch_proof(h, root)
+        self.assertEqual(proof_all.copath, [])
+        self.assertTrue(manager.verify_batch_proof(h, proof_all, root.value))
+
+        # Three leaves (h2 duplicated); proofs use the expanded tree
+        root_three = build_merkle_tree_from_hashes(h[:3])
+        proof_three = manager.generate_batch_proof([h[1], h[2]], root_three)
+        self.assertEqual(proof_three, BatchMerkleProof(2, [1, 2], [h[0], h[2]]))
+        self.assertTrue(manager.verify_batch_proof([h[1], h[2]], proof_three, root_three.value))
+
+        # Tampering, missing or surplus siblings, mismatched leaves and wrong roots are rejected
+        self.assertFalse(manager.verify_batch_proof([h[0], h[2]], proof._replace(copath=[h[1], p01]), root.value))
+        self.assertFalse(manager.verify_batch_proof([h[0], h[2]], proof._replace(copath=[h[1]]), root.value))
+        self.assertFalse(manager.verify_batch_proof([h[0], h[2]], proof._replace(copath=[h[1], h[3], h[3]]), root.value))
+        self.assertFalse(manager.verify_batch_proof([h[2], h[0]], proof, root.value))
+        self.assertFalse(manager.verify_batch_proof([h[0]], proof, root.value))
+        self.assertFalse(manager.verify_batch_proof([h[0], h[2]], proof, root_three.value))
+
+        # Malformed proofs fail verification instead of raising
+        for malformed in (proof._replace(height=-1), proof._replace(height="2"), proof._replace(height=10**9),
+                          proof._replace(leaf_indices=[0, "2"]), proof._replace(copath=[h[1], "not-hex"]),
+                          proof._replace(copath=[h[1], None]), proof._replace(copath=[h[1], h[3], None]),
+                          proof._replace(copath=[])):
+            with self.subTest(proof=malformed):
+                self.assertFalse(manager.verify_batch_proof([h[0], h[2]], malformed, root.value))
+        self.assertFalse(manager.verify_batch_proof([h[0], "not-hex"], proof, root.value))
+
+        # Leaf not in tree, empty tree
+        self.assertIsNone(manager.generate_batch_proof([h[0], hash_data("not_in_tree")], root))
+        self.assertIsNone(manager.generate_batch_proof([h[0]], None))
+
 
 if __name__ == '__main__':
     unittest.main()